@@ -177,15 +177,16 @@ class TypeVariableReference(TypeConstant):
 # Methods
 #
 
+# integer type constants carry no state, so one instance per width is shared by all callers
+_INT_TYPES = {
+    1: Int1(),
+    8: Int8(),
+    16: Int16(),
+    32: Int32(),
+    64: Int64(),
+    128: Int128(),
+}
+
+
 def int_type(bits):
-    mapping = {
-        1: Int1,
-        8: Int8,
-        16: Int16,
-        32: Int32,
-        64: Int64,
-        128: Int128,
-    }
-    if bits in mapping:
-        return mapping[bits]()
-    return None
+    return _INT_TYPES.get(bits, None)
@@ -1,4 +1,4 @@
-from typing import Dict, Any, Optional, TYPE_CHECKING
+from typing import Dict, Tuple, Any, Optional, TYPE_CHECKING
 from itertools import count
 
 from ...utils.cowdict import ChainMapCOW
@@ -363,6 +363,22 @@ class TypeVariables:
 
         return self._typevars[var] #[codeloc]
 
+    def get_or_add_type_variable(self, var: 'SimVariable', codeloc) -> Tuple[TypeVariable,bool]:
+        """
+        Get the type variable for a variable, or create and add a new one if there is none.
+
+        :param var:     The variable.
+        :param codeloc: The code location.
+        :return:        A tuple of the type variable and whether it was newly created.
+        """
+
+        try:
+            return self._typevars[var], False
+        except KeyError:
+            typevar = TypeVariable()
+            self.add_type_variable(var, codeloc, typevar)
+            return typevar, True
+
     def has_type_variable_for(self, var: 'SimVariable', codeloc):  # pylint:disable=unused-argument
         if var not in self._typevars:
             return False
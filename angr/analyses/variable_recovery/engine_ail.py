@@ -222,7 +222,7 @@ class SimEngineVRAIL(
             for value in vs:
                 for _, v in self.state.extract_variables(value):
                     try:
-                        typevar = self.state.typevars.get_type_variable(v, self._codeloc())
+                        typevar = self.state.typevars.get_type_variable(v, self._current_codeloc)
                         typevar_set.add(typevar)
                     except KeyError:
                         pass
@@ -238,7 +238,7 @@ class SimEngineVRAIL(
         value_v = self.state.stack_address(expr.offset)
         richr = RichR(value_v, typevar=typevar)
         if self._reference_spoffset:
-            self._reference(richr, self._codeloc(), src=expr)
+            self._reference(richr, self._current_codeloc, src=expr)
 
         return richr
 
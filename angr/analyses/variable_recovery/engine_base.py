@@ -1,11 +1,11 @@
-from typing import Optional, Set, List, Tuple, TYPE_CHECKING
+from typing import Optional, Set, List, Tuple, Dict, Generator, TYPE_CHECKING
 import logging
 
 import claripy
 
 from ...storage.memory_mixins.paged_memory.pages.multi_values import MultiValues
 from ...engines.light import SimEngineLight, ArithmeticExpression
-from ...errors import SimEngineError, SimMemoryMissingError
+from ...errors import SimEngineError
 from ...sim_variable import SimVariable, SimStackVariable, SimRegisterVariable, SimMemoryVariable
 from ...code_location import CodeLocation
 from ..typehoon import typevars, typeconsts
@@ -20,6 +20,19 @@ if TYPE_CHECKING:
 
 l = logging.getLogger(name=__name__)
 
+_ADD = ArithmeticExpression.Add
+
+
+def _iter_vars(state: 'VariableRecoveryStateBase',
+               mv: MultiValues) -> Generator[Tuple[int,SimVariable],None,None]:
+    """
+    Iterate over all (offset, variable) pairs that are annotated on values in a MultiValues object.
+    """
+    extract = state.extract_variables
+    for values in mv.values.values():
+        for v in values:
+            yield from extract(v)
+
 
 class RichR:
     """
@@ -36,7 +49,7 @@ class RichR:
         self.type_constraints = type_constraints
 
     @property
-    def bits(self):
+    def bits(self) -> Optional[int]:
         if self.data is not None and not isinstance(self.data, (int, float)):
             if isinstance(self.data, claripy.ast.Base):
                 return self.data.size()
@@ -60,8 +73,40 @@ class SimEngineVRBase(SimEngineLight):
         self.kb = kb
         self.variable_manager: Optional['VariableManager'] = None
 
+        # the architecture is fixed for the lifetime of the engine. cache the properties that are used per statement
+        arch = project.arch
+        self._byte_width: int = arch.byte_width
+        self._memory_endness: str = arch.memory_endness
+        self._sp_bp_offsets: Tuple[int,int] = (arch.sp_offset, arch.bp_offset)
+        self._artificial_registers: Dict[Tuple[int,int],bool] = { }
+
+        # the code location of the statement that is being processed, and the (block, stmt_idx, ins_addr) it is for
+        self._codeloc_key: Optional[Tuple] = None
+        self._codeloc_cache: Optional[CodeLocation] = None
+
+    def _is_artificial_register(self, offset: int, size: int) -> bool:
+        key = offset, size
+        r = self._artificial_registers.get(key, None)
+        if r is None:
+            r = self.project.arch.is_artificial_register(offset, size)
+            self._artificial_registers[key] = r
+        return r
+
+    @property
+    def _current_codeloc(self) -> CodeLocation:
+        """
+        The code location of the current statement. It is created once per statement and shared by all accesses that
+        are recorded while processing that statement.
+        """
+        key = self.block, self.stmt_idx, self.ins_addr
+        cached_key = self._codeloc_key
+        if cached_key is None or cached_key[0] is not key[0] or cached_key[1:] != key[1:]:
+            self._codeloc_cache = self._codeloc()
+            self._codeloc_key = key
+        return self._codeloc_cache
+
     @property
-    def func_addr(self):
+    def func_addr(self) -> Optional[int]:
         if self.state is None:
             return None
         return self.state.function.addr
@@ -77,13 +122,15 @@ class SimEngineVRBase(SimEngineLight):
                 raise e
 
     def _process(self, state, successors, block=None, func_addr=None):  # pylint:disable=unused-argument,arguments-differ
+        self._codeloc_key = None
+        self._codeloc_cache = None
         super()._process(state, successors, block=block)
 
     #
     # Logic
     #
 
-    def _reference(self, richr: RichR, codeloc: CodeLocation, src=None):
+    def _reference(self, richr: RichR, codeloc: CodeLocation, src=None) -> None:
         data: claripy.ast.Base = richr.data
         # extract stack offset
         if data is not None and self.state.is_stack_address(data):
@@ -92,70 +139,62 @@ class SimEngineVRBase(SimEngineLight):
         else:
             return
 
-        var_candidates: List[Tuple[SimVariable,int]] = self.variable_manager[self.func_addr].find_variables_by_stmt(
-            self.block.addr,
-            self.stmt_idx,
-            'memory')
-
-        # find the correct variable
+        variable_manager = self.variable_manager[self.func_addr]
         existing_vars: List[Tuple[SimVariable,int]] = [ ]
-        for candidate, offset in var_candidates:
-            if isinstance(candidate, SimStackVariable) and candidate.offset == stack_offset:
-                existing_vars.append((candidate, offset))
         variable = None
-        if existing_vars:
-            variable, _ = existing_vars[0]
-
         vs = None
         if stack_offset is not None:
+            # find the correct variable
+            var_candidates: List[Tuple[SimVariable,int]] = variable_manager.find_variables_by_stmt(self.block.addr,
+                                                                                                   self.stmt_idx,
+                                                                                                   'memory')
+            for candidate, offset in var_candidates:
+                if isinstance(candidate, SimStackVariable) and candidate.offset == stack_offset:
+                    existing_vars.append((candidate, offset))
+
             stack_addr = self.state.stack_addr_from_offset(stack_offset)
-            if variable is None:
+            if existing_vars:
+                # the variable is already known at this statement. no need to look into the stack region
+                variable = existing_vars[0][0]
+            else:
                 # TODO: how to determine the size for a lea?
-                try:
-                    vs: Optional[MultiValues] = self.state.stack_region.load(stack_addr, size=1)
-                except SimMemoryMissingError:
-                    vs = None
+                vs: Optional[MultiValues] = self.state.stack_region.load_optional(stack_addr, size=1)
 
                 if vs is not None:
                     # extract variables
-                    for values in vs.values.values():
-                        for v in values:
-                            for var_stack_offset, var in self.state.extract_variables(v):
-                                existing_vars.append((var, var_stack_offset))
+                    for var_stack_offset, var in _iter_vars(self.state, vs):
+                        existing_vars.append((var, var_stack_offset))
 
-                if not existing_vars:
+                if existing_vars:
+                    # FIXME: Why is it only taking the first variable?
+                    variable = existing_vars[0][0]
+                else:
                     # no variables exist
                     lea_size = 1
                     variable = SimStackVariable(stack_offset, lea_size, base='bp',
-                                                ident=self.variable_manager[self.func_addr].next_variable_ident(
-                                                    'stack'),
+                                                ident=variable_manager.next_variable_ident('stack'),
                                                 region=self.func_addr,
                                                 )
-                    self.variable_manager[self.func_addr].add_variable('stack', stack_offset, variable)
+                    variable_manager.add_and_reference_at('stack', stack_offset, variable, None, codeloc, atom=src)
                     l.debug('Identified a new stack variable %s at %#x.', variable, self.ins_addr)
-                    existing_vars.append((variable, 0))
-
-                else:
-                    # FIXME: Why is it only taking the first variable?
-                    variable = next(iter(existing_vars))[0]
 
             # write the variable back to stack
             if vs is None:
-                top = self.state.top(self.arch.byte_width)
+                top = self.state.top(self._byte_width)
                 top = self.state.annotate_with_variables(top, [(0, variable)])
-                vs = MultiValues(offset_to_values={0: {top}})
+                vs = MultiValues.from_single(top)
             self.state.stack_region.store(stack_addr, vs)
 
         typevar = typevars.TypeVariable() if richr.typevar is None else richr.typevar
         self.state.typevars.add_type_variable(variable, codeloc, typevar)
 
-        # find all variables
+        # find all existing variables
         for var, offset in existing_vars:
             if offset == 0:
                 offset = None
-            self.variable_manager[self.func_addr].reference_at(var, offset, codeloc, atom=src)
+            variable_manager.reference_at(var, offset, codeloc, atom=src)
 
-    def _assign_to_register(self, offset, richr, size, src=None, dst=None):
+    def _assign_to_register(self, offset, richr, size, src=None, dst=None) -> None:
         """
 
         :param int offset:
@@ -164,42 +203,43 @@ class SimEngineVRBase(SimEngineLight):
         :return:
         """
 
-        codeloc: CodeLocation = self._codeloc()
+        codeloc: CodeLocation = self._current_codeloc
         data: claripy.ast.Base = richr.data
 
         # lea
-        self._reference(richr, codeloc, src=src)
+        # most register writes are not stack addresses. check it here to save a call into _reference()
+        if data is not None and self.state.is_stack_address(data):
+            self._reference(richr, codeloc, src=src)
 
         # handle register writes
-        existing_vars = self.variable_manager[self.func_addr].find_variables_by_atom(self.block.addr, self.stmt_idx,
-                                                                                     dst)
-        existing_vars: Set[Tuple[SimVariable,int]]
+        variable_manager = self.variable_manager[self.func_addr]
+        existing_vars: Set[Tuple[SimVariable,int]] = variable_manager.find_variables_by_atom(self.block.addr,
+                                                                                             self.stmt_idx,
+                                                                                             dst)
         if not existing_vars:
             variable = SimRegisterVariable(offset, size,
-                                           ident=self.variable_manager[self.func_addr].next_variable_ident(
-                                               'register'),
+                                           ident=variable_manager.next_variable_ident('register'),
                                            region=self.func_addr
                                            )
-            self.variable_manager[self.func_addr].set_variable('register', offset, variable)
+            # register with the variable manager
+            variable_manager.add_and_write_to('register', offset, variable, None, codeloc, atom=dst, replace=True)
         else:
             variable, _ = next(iter(existing_vars))
+            # register with the variable manager
+            variable_manager.write_to(variable, None, codeloc, atom=dst)
 
         annotated_data = self.state.annotate_with_variables(data, [(0, variable)])  # FIXME: The offset does not have to be 0
-        v = MultiValues(offset_to_values={0: {annotated_data}})
+        v = MultiValues.from_single(annotated_data)
         self.state.register_region.store(offset, v)
-        # register with the variable manager
-        self.variable_manager[self.func_addr].write_to(variable, None, codeloc, atom=dst)
-
-        if not self.arch.is_artificial_register(offset, size) and richr.typevar is not None:
-            if not self.state.typevars.has_type_variable_for(variable, codeloc):
-                # assign a new type variable to it
-                typevar = typevars.TypeVariable()
-                self.state.typevars.add_type_variable(variable, codeloc, typevar)
-                # create constraints
+
+        if not self._is_artificial_register(offset, size) and richr.typevar is not None:
+            typevar, created = self.state.typevars.get_or_add_type_variable(variable, codeloc)
+            if created:
+                # a new type variable is assigned to it. create constraints
                 self.state.add_type_constraint(typevars.Subtype(richr.typevar, typevar))
                 self.state.add_type_constraint(typevars.Subtype(typevar, typeconsts.int_type(variable.size * 8)))
 
-    def _store(self, richr_addr: RichR, data: RichR, size, stmt=None):  # pylint:disable=unused-argument
+    def _store(self, richr_addr: RichR, data: RichR, size, stmt=None) -> None:  # pylint:disable=unused-argument
         """
 
         :param RichR addr:
@@ -215,82 +255,95 @@ class SimEngineVRBase(SimEngineLight):
             self._store_to_global(addr._model_concrete.value, data, size, stmt=stmt)
             stored = True
         else:
-            if self.state.is_stack_address(addr):
-                stack_offset = self.state.get_stack_offset(addr)
-                if stack_offset is not None:
-                    # Storing data to stack
-                    self._store_to_stack(stack_offset, data, size, stmt=stmt)
-                    stored = True
+            # get_stack_offset() returns None for non-stack addresses
+            stack_offset = self.state.get_stack_offset(addr)
+            if stack_offset is not None:
+                # Storing data to stack
+                self._store_to_stack(stack_offset, data.data, size, data_typevar=data.typevar, stmt=stmt)
+                stored = True
 
         if not stored:
             # storing to a location specified by a pointer whose value cannot be determined at this point
             self._store_to_variable(richr_addr, size, stmt=stmt)
 
-    def _store_to_stack(self, stack_offset, data: RichR, size, stmt=None, endness=None):
+    def _store_to_stack(self, stack_offset, data: claripy.ast.Base, size, data_typevar=None, stmt=None,
+                        endness=None) -> None:
+        """
+        Store data to the stack. The data is passed in as a claripy AST instead of a RichR, and its type variable (if
+        there is one) is passed in separately, so that untyped stores do not touch any type variables.
+
+        :param stack_offset:    The stack offset to store to.
+        :param data:            The data to store.
+        :param int size:        Size of the store in bytes.
+        :param data_typevar:    Type variable of the data, or None if the data is untyped.
+        :param stmt:            The store statement.
+        :param endness:         Endianness of the store.
+        :return:                None
+        """
+
+        state = self.state
+        block_addr = self.block.addr
+        stmt_idx = self.stmt_idx
+        variable_manager = self.variable_manager[self.func_addr]
         if stmt is None:
-            existing_vars = self.variable_manager[self.func_addr].find_variables_by_stmt(self.block.addr,
-                                                                                         self.stmt_idx,
-                                                                                         'memory'
-                                                                                         )
+            existing_vars = variable_manager.find_variables_by_stmt(block_addr, stmt_idx, 'memory')
         else:
-            existing_vars = self.variable_manager[self.func_addr].find_variables_by_atom(self.block.addr,
-                                                                                         self.stmt_idx,
-                                                                                         stmt
-                                                                                         )
+            existing_vars = variable_manager.find_variables_by_atom(block_addr, stmt_idx, stmt)
         if not existing_vars:
             variable = SimStackVariable(stack_offset, size, base='bp',
-                                        ident=self.variable_manager[self.func_addr].next_variable_ident(
-                                            'stack'),
+                                        ident=variable_manager.next_variable_ident('stack'),
                                         region=self.func_addr,
                                         )
             variable_offset = 0
-            if isinstance(stack_offset, int):
-                self.variable_manager[self.func_addr].set_variable('stack', stack_offset, variable)
-                l.debug('Identified a new stack variable %s at %#x.', variable, self.ins_addr)
-
         else:
             variable, variable_offset = next(iter(existing_vars))
 
         if isinstance(stack_offset, int):
-            expr = self.state.annotate_with_variables(data.data, [(variable_offset, variable)])
-            stack_addr = self.state.stack_addr_from_offset(stack_offset)
-            self.state.stack_region.store(stack_addr, expr, endness=endness)
+            expr = state.annotate_with_variables(data, [(variable_offset, variable)])
+            stack_addr = state.stack_addr_from_offset(stack_offset)
+            state.stack_region.store(stack_addr, expr, endness=endness)
+
+            codeloc = self._current_codeloc
 
-            codeloc = CodeLocation(self.block.addr, self.stmt_idx, ins_addr=self.ins_addr)
+            if expr.size() == size * self._byte_width:
+                # the stored expression covers the entire range, so loading it back would only give us the variables
+                # that we just annotated it with
+                addr_and_variables = set(state.extract_variables(expr))
+            else:
+                # the stored expression is narrower than the store. load it back to discover adjacent or overlapping
+                # variables
+                addr_and_variables = set()
+                vs: Optional[MultiValues] = state.stack_region.load_optional(stack_addr, size, endness=endness)
+                if vs is not None:
+                    addr_and_variables.update(_iter_vars(state, vs))
 
-            addr_and_variables = set()
-            try:
-                vs: MultiValues = self.state.stack_region.load(stack_addr, size, endness=endness)
-                for values in vs.values.values():
-                    for value in values:
-                        addr_and_variables.update(self.state.extract_variables(value))
-            except SimMemoryMissingError:
-                pass
+            if not existing_vars:
+                # add the new variable and record the write to it at the same time
+                variable_manager.add_and_write_to('stack', stack_offset, variable, None, codeloc, atom=stmt,
+                                                  replace=True)
+                l.debug('Identified a new stack variable %s at %#x.', variable, self.ins_addr)
+                addr_and_variables.discard((0, variable))
 
             for var_offset, var in addr_and_variables:
                 offset_into_var = var_offset
                 if offset_into_var == 0:
                     offset_into_var = None
-                self.variable_manager[self.func_addr].write_to(var,
-                                                               offset_into_var,
-                                                               codeloc,
-                                                               atom=stmt,
-                                                               )
+                variable_manager.write_to(var,
+                                          offset_into_var,
+                                          codeloc,
+                                          atom=stmt,
+                                          )
 
             # create type constraints
-            if data.typevar is not None:
-                if not self.state.typevars.has_type_variable_for(variable, codeloc):
-                    typevar = typevars.TypeVariable()
-                    self.state.typevars.add_type_variable(variable, codeloc, typevar)
-                else:
-                    typevar = self.state.typevars.get_type_variable(variable, codeloc)
-                if typevar is not None:
-                    self.state.add_type_constraint(
-                        typevars.Subtype(data.typevar, typevar)
+            if data_typevar is not None:
+                typevar, _ = state.typevars.get_or_add_type_variable(variable, codeloc)
+                if typevar is not None and typevar is not data_typevar:
+                    state.add_type_constraint(
+                        typevars.Subtype(data_typevar, typevar)
                     )
         # TODO: Create a tv_sp.store.<bits>@N <: typevar type constraint for the stack pointer
 
-    def _store_to_global(self, addr: int, data: RichR, size: int, stmt=None):
+    def _store_to_global(self, addr: int, data: RichR, size: int, stmt=None) -> None:
         variable_manager = self.variable_manager['global']
         if stmt is None:
             existing_vars = variable_manager.find_variables_by_stmt(self.block.addr, self.stmt_idx, 'memory')
@@ -300,50 +353,45 @@ class SimEngineVRBase(SimEngineLight):
             variable = SimMemoryVariable(addr, size,
                                         ident=variable_manager.next_variable_ident('global'),
                                         )
-            variable_manager.set_variable('global', addr, variable)
-            l.debug('Identified a new global variable %s at %#x.', variable, self.ins_addr)
-
         else:
             variable, _ = next(iter(existing_vars))
 
+        endness = self._memory_endness if stmt is None else stmt.endness
+
         data_expr: claripy.ast.Base = data.data
         data_expr = self.state.annotate_with_variables(data_expr, [(0, variable)])
 
         self.state.global_region.store(addr,
                                        data_expr,
-                                       endness=self.state.arch.memory_endness if stmt is None else stmt.endness)
+                                       endness=endness)
 
-        codeloc = CodeLocation(self.block.addr, self.stmt_idx, ins_addr=self.ins_addr)
-        try:
-            values: MultiValues = self.state.global_region.load(
-                addr,
-                size=size,
-                endness=self.state.arch.memory_endness if stmt is None else stmt.endness)
-        except SimMemoryMissingError:
-            values = None
+        codeloc = self._current_codeloc
+        if not existing_vars:
+            # add the new variable and record the write to it at the same time
+            variable_manager.add_and_write_to('global', addr, variable, 0, codeloc, atom=stmt, replace=True)
+            l.debug('Identified a new global variable %s at %#x.', variable, self.ins_addr)
+
+        values: Optional[MultiValues] = self.state.global_region.load_optional(addr, size=size, endness=endness)
 
         if values is not None:
-            for vs in values.values.values():
-                for v in vs:
-                    for var_offset, var in self.state.extract_variables(v):
-                        variable_manager.write_to(var, var_offset, codeloc, atom=stmt)
+            for var_offset, var in _iter_vars(self.state, values):
+                if var is variable and var_offset == 0 and not existing_vars:
+                    # already recorded above
+                    continue
+                variable_manager.write_to(var, var_offset, codeloc, atom=stmt)
 
         # create type constraints
         if data.typevar is not None:
-            if not self.state.typevars.has_type_variable_for(variable, codeloc):
-                typevar = typevars.TypeVariable()
-                self.state.typevars.add_type_variable(variable, codeloc, typevar)
-            else:
-                typevar = self.state.typevars.get_type_variable(variable, codeloc)
-            if typevar is not None:
+            typevar, _ = self.state.typevars.get_or_add_type_variable(variable, codeloc)
+            if typevar is not None and typevar is not data.typevar:
                 self.state.add_type_constraint(
                     typevars.Subtype(data.typevar, typevar)
                 )
 
-    def _store_to_variable(self, richr_addr: RichR, size: int, stmt=None):  # pylint:disable=unused-argument
+    def _store_to_variable(self, richr_addr: RichR, size: int, stmt=None) -> None:  # pylint:disable=unused-argument
 
         addr_variable = richr_addr.variable
-        codeloc = self._codeloc()
+        codeloc = self._current_codeloc
 
         # Storing data into a pointer
         if richr_addr.type_constraints:
@@ -368,13 +416,13 @@ class SimEngineVRBase(SimEngineLight):
 
             store_typevar = typevars.DerivedTypeVariable(
                 typevars.DerivedTypeVariable(base_typevar, typevars.Store()),
-                typevars.HasField(size * self.state.arch.byte_width, field_offset)
+                typevars.HasField(size * self._byte_width, field_offset)
             )
             if addr_variable is not None:
                 self.state.typevars.add_type_variable(addr_variable, codeloc, typevar)
             self.state.add_type_constraint(typevars.Existence(store_typevar))
 
-    def _load(self, richr_addr: RichR, size: int, expr=None):
+    def _load(self, richr_addr: RichR, size: int, expr=None) -> RichR:
         """
 
         :param RichR richr_addr:
@@ -383,108 +431,104 @@ class SimEngineVRBase(SimEngineLight):
         """
 
         addr: claripy.ast.Base = richr_addr.data
-        codeloc = CodeLocation(self.block.addr, self.stmt_idx, ins_addr=self.ins_addr)
+        state = self.state
+        bits = size * self._byte_width
+        endness = self._memory_endness
+        codeloc = self._current_codeloc
 
-        if self.state.is_stack_address(addr):
-            stack_offset = self.state.get_stack_offset(addr)
-            if stack_offset is not None:
-                # Loading data from stack
-
-                # split the offset into a concrete offset and a dynamic offset
-                # the stack offset may not be a concrete offset
-                # for example, SP-0xe0+var_1
-                if type(stack_offset) is ArithmeticExpression:
-                    if type(stack_offset.operands[0]) is int:
-                        concrete_offset = stack_offset.operands[0]
-                        dynamic_offset = stack_offset.operands[1]
-                    elif type(stack_offset.operands[1]) is int:
-                        concrete_offset = stack_offset.operands[1]
-                        dynamic_offset = stack_offset.operands[0]
-                    else:
-                        # cannot determine the concrete offset. give up
-                        concrete_offset = None
-                        dynamic_offset = stack_offset
+        # get_stack_offset() returns None for non-stack addresses
+        stack_offset = state.get_stack_offset(addr)
+        if stack_offset is not None:
+            # Loading data from stack
+            variable_manager = self.variable_manager[self.func_addr]
+
+            # split the offset into a concrete offset and a dynamic offset
+            # the stack offset may not be a concrete offset
+            # for example, SP-0xe0+var_1
+            if type(stack_offset) is ArithmeticExpression:
+                if type(stack_offset.operands[0]) is int:
+                    concrete_offset = stack_offset.operands[0]
+                    dynamic_offset = stack_offset.operands[1]
+                elif type(stack_offset.operands[1]) is int:
+                    concrete_offset = stack_offset.operands[1]
+                    dynamic_offset = stack_offset.operands[0]
                 else:
-                    # type(stack_offset) is int
-                    concrete_offset = stack_offset
-                    dynamic_offset = None
-
-                try:
-                    values: Optional[MultiValues] = self.state.stack_region.load(
-                        self.state.stack_addr_from_offset(concrete_offset),
-                        size=size,
-                        endness=self.state.arch.memory_endness)
-
-                except SimMemoryMissingError:
-                    values = None
-
-                all_vars: Set[Tuple[int,SimVariable]] = set()
-                if values:
-                    for vs in values.values.values():
-                        for v in vs:
-                            for var_offset, var_ in self.state.extract_variables(v):
-                                all_vars.add((var_offset, var_))
-
-                if not all_vars:
-                    variable = SimStackVariable(concrete_offset, size, base='bp',
-                                                ident=self.variable_manager[self.func_addr].next_variable_ident(
-                                                    'stack'),
-                                                region=self.func_addr,
-                                                )
-                    v = self.state.top(size * self.state.arch.byte_width)
-                    v = self.state.annotate_with_variables(v, [(0, variable)])
-                    stack_addr = self.state.stack_addr_from_offset(concrete_offset)
-                    self.state.stack_region.store(stack_addr, v, endness=self.state.arch.memory_endness)
-
-                    self.variable_manager[self.func_addr].add_variable('stack', concrete_offset, variable)
+                    # cannot determine the concrete offset. give up
+                    concrete_offset = None
+                    dynamic_offset = stack_offset
+            else:
+                # type(stack_offset) is int
+                concrete_offset = stack_offset
+                dynamic_offset = None
+
+            stack_addr = state.stack_addr_from_offset(concrete_offset)
+            values: Optional[MultiValues] = state.stack_region.load_optional(stack_addr, size=size, endness=endness)
+
+            # a list keeps the first variable deterministic and avoids hashing variables in the common case where
+            # there is only one
+            all_vars: List[Tuple[int,SimVariable]] = [ ]
+            if values:
+                for offset_and_var in _iter_vars(state, values):
+                    if offset_and_var not in all_vars:
+                        all_vars.append(offset_and_var)
+
+            new_variable: Optional[SimStackVariable] = None
+            if not all_vars:
+                variable = SimStackVariable(concrete_offset, size, base='bp',
+                                            ident=variable_manager.next_variable_ident('stack'),
+                                            region=self.func_addr,
+                                            )
+                v = state.top(bits)
+                v = state.annotate_with_variables(v, [(0, variable)])
+                state.stack_region.store(stack_addr, v, endness=endness)
 
-                    l.debug('Identified a new stack variable %s at %#x.', variable, self.ins_addr)
+                l.debug('Identified a new stack variable %s at %#x.', variable, self.ins_addr)
 
-                    all_vars = { (0, variable) }
+                all_vars = [ (0, variable) ]
+                new_variable = variable
 
-                if len(all_vars) > 1:
-                    # overlapping variables
-                    l.warning("Reading memory with overlapping variables: %s. Ignoring all but the first one.",
-                              all_vars)
+            if len(all_vars) > 1:
+                # overlapping variables
+                l.warning("Reading memory with overlapping variables: %s. Ignoring all but the first one.",
+                          all_vars)
 
-                var_offset, var = next(iter(all_vars))  # won't fail
-                # calculate variable_offset
-                if dynamic_offset is None:
-                    offset_into_variable = None
+            var_offset, var = all_vars[0]  # won't fail
+            # calculate variable_offset
+            if dynamic_offset is None:
+                offset_into_variable = None
+            else:
+                if var_offset == 0:
+                    offset_into_variable = dynamic_offset
                 else:
-                    if var_offset == 0:
-                        offset_into_variable = dynamic_offset
-                    else:
-                        offset_into_variable = ArithmeticExpression(ArithmeticExpression.Add,
-                                                                    (dynamic_offset, var_offset,)
-                                                                    )
-                self.variable_manager[self.func_addr].read_from(var,
-                                                                offset_into_variable,
-                                                                codeloc,
-                                                                atom=expr,
-                                                                # overwrite=True
-                                                                )
+                    offset_into_variable = ArithmeticExpression(_ADD, (dynamic_offset, var_offset,))
+            if new_variable is not None:
+                # add the new variable and record the read from it at the same time
+                variable_manager.add_and_read_from('stack', concrete_offset, new_variable, offset_into_variable,
+                                                   codeloc, atom=expr)
+            else:
+                variable_manager.read_from(var,
+                                           offset_into_variable,
+                                           codeloc,
+                                           atom=expr,
+                                           # overwrite=True
+                                           )
 
-                # add delayed type constraints
-                if var in self.state.delayed_type_constraints:
-                    for constraint in self.state.delayed_type_constraints[var]:
-                        self.state.add_type_constraint(constraint)
-                    self.state.delayed_type_constraints.pop(var)
-                # create type constraints
-                if not self.state.typevars.has_type_variable_for(var, codeloc):
-                    typevar = typevars.TypeVariable()
-                    self.state.typevars.add_type_variable(var, codeloc, typevar)
-                else:
-                    typevar = self.state.typevars.get_type_variable(var, codeloc)
-                # TODO: Create a tv_sp.load.<bits>@N type variable for the stack variable
-                #typevar = typevars.DerivedTypeVariable(
-                #    typevars.DerivedTypeVariable(typevar, typevars.Load()),
-                #    typevars.HasField(size * 8, 0)
-                #)
+            # add delayed type constraints
+            delayed_constraints = state.delayed_type_constraints.pop(var, None)
+            if delayed_constraints:
+                for constraint in delayed_constraints:
+                    state.add_type_constraint(constraint)
+            # create type constraints
+            typevar, _ = state.typevars.get_or_add_type_variable(var, codeloc)
+            # TODO: Create a tv_sp.load.<bits>@N type variable for the stack variable
+            #typevar = typevars.DerivedTypeVariable(
+            #    typevars.DerivedTypeVariable(typevar, typevars.Load()),
+            #    typevars.HasField(size * 8, 0)
+            #)
 
-                r = self.state.top(size * self.state.arch.byte_width)
-                r = self.state.annotate_with_variables(r, list(all_vars))
-                return RichR(r, variable=var, typevar=typevar)
+            r = state.top(bits)
+            r = state.annotate_with_variables(r, all_vars)
+            return RichR(r, variable=var, typevar=typevar)
 
         elif addr.concrete:
             # Loading data from memory
@@ -493,10 +537,10 @@ class SimEngineVRBase(SimEngineLight):
             variables = global_variables.get_global_variables(addr_v)
             if not variables:
                 var = SimMemoryVariable(addr_v, size, ident=global_variables.next_variable_ident('global'))
-                global_variables.add_variable('global', addr_v, var)
-                variables = [var]
-            for var in variables:
-                global_variables.read_from(var, None, codeloc, atom=expr)
+                global_variables.add_and_read_from('global', addr_v, var, None, codeloc, atom=expr)
+            else:
+                for var in variables:
+                    global_variables.read_from(var, None, codeloc, atom=expr)
 
         # Loading data from a pointer
         if richr_addr.type_constraints:
@@ -516,14 +560,14 @@ class SimEngineVRBase(SimEngineLight):
             # create a type constraint
             typevar = typevars.DerivedTypeVariable(
                 typevars.DerivedTypeVariable(richr_addr_typevar, typevars.Load()),
-                typevars.HasField(size * self.state.arch.byte_width, offset)
+                typevars.HasField(bits, offset)
             )
             self.state.add_type_constraint(typevars.Existence(typevar))
-            return RichR(self.state.top(size * self.state.arch.byte_width), typevar=typevar)
+            return RichR(self.state.top(bits), typevar=typevar)
         else:
-            return RichR(self.state.top(size * self.state.arch.byte_width))
+            return RichR(self.state.top(bits))
 
-    def _read_from_register(self, offset, size, expr=None):
+    def _read_from_register(self, offset, size, expr=None) -> RichR:
         """
 
         :param offset:
@@ -531,37 +575,33 @@ class SimEngineVRBase(SimEngineLight):
         :return:
         """
 
-        codeloc = self._codeloc()
+        codeloc = self._current_codeloc
+        bits = size * self._byte_width
 
-        try:
-            values: Optional[MultiValues] = self.state.register_region.load(offset, size=size)
-        except SimMemoryMissingError:
-            values = None
+        values: Optional[MultiValues] = self.state.register_region.load_optional(offset, size=size)
 
+        variable_manager = self.variable_manager[self.func_addr]
         if not values:
             # the value does not exist. create a new variable
             variable = SimRegisterVariable(offset, size,
-                                           ident=self.variable_manager[self.func_addr].next_variable_ident(
-                                               'register'),
+                                           ident=variable_manager.next_variable_ident('register'),
                                            region=self.func_addr,
                                            )
-            value = self.state.top(size * self.state.arch.byte_width)
+            value = self.state.top(bits)
             value = self.state.annotate_with_variables(value, [(0, variable)])
             self.state.register_region.store(offset, value)
-            self.variable_manager[self.func_addr].add_variable('register', offset, variable)
+            variable_manager.add_and_read_from('register', offset, variable, None, codeloc, atom=expr)
 
             value_list = [{ value }]
+            variable_set = { variable }
         else:
             value_list = list(values.values.values())
+            variable_set = set()
+            for _, var in _iter_vars(self.state, values):
+                variable_manager.read_from(var, None, codeloc, atom=expr)
+                variable_set.add(var)
 
-        variable_set = set()
-        for value_set in value_list:
-            for value in value_set:
-                for _, var in self.state.extract_variables(value):
-                    self.variable_manager[self.func_addr].read_from(var, None, codeloc, atom=expr)
-                    variable_set.add(var)
-
-        if self.arch.is_artificial_register(offset, size) or offset in (self.arch.sp_offset, self.arch.bp_offset):
+        if self._is_artificial_register(offset, size) or offset in self._sp_bp_offsets:
             typevar = None
             var = None
         else:
@@ -573,21 +613,15 @@ class SimEngineVRBase(SimEngineLight):
                 var = next(iter(variable_set))
 
                 # add delayed type constraints
-                if var in self.state.delayed_type_constraints:
-                    for constraint in self.state.delayed_type_constraints[var]:
+                delayed_constraints = self.state.delayed_type_constraints.pop(var, None)
+                if delayed_constraints:
+                    for constraint in delayed_constraints:
                         self.state.add_type_constraint(constraint)
-                    self.state.delayed_type_constraints.pop(var)
 
-                if var not in self.state.typevars:
-                    typevar = typevars.TypeVariable()
-                    self.state.typevars.add_type_variable(var, codeloc, typevar)
-                else:
-                    # FIXME: This is an extremely stupid hack. Fix it later.
-                    # typevar = next(reversed(list(self.state.typevars[var].values())))
-                    typevar = self.state.typevars[var]
+                typevar, _ = self.state.typevars.get_or_add_type_variable(var, codeloc)
 
         if len(value_list) == 1:
             r_value = next(iter(value_list[0]))
         else:
-            r_value = self.state.top(size * self.arch.byte_width)  # fall back to top
+            r_value = self.state.top(bits)  # fall back to top
         return RichR(r_value, variable=var, typevar=typevar)
@@ -124,6 +124,11 @@ class VariableRecoveryStateBase:
     """
 
     _tops = {}
+    # bits -> (stack base address, address mask)
+    _stack_bases = {
+        32: (0x7fff_fe00, 0xffff_ffff),
+        64: (0x7f_ffff_fffe_0000, 0xffff_ffff_ffff_ffff),
+    }
 
     def __init__(self, block_addr, analysis, arch, func, stack_region=None, register_region=None, global_region=None,
                  typevars=None, type_constraints=None, delayed_type_constraints=None, project=None):
@@ -178,10 +183,10 @@ class VariableRecoveryStateBase:
 
     @staticmethod
     def top(bits) -> claripy.ast.BV:
-        if bits in VariableRecoveryStateBase._tops:
-            return VariableRecoveryStateBase._tops[bits]
-        r = claripy.BVS("top", bits, explicit_name=True)
-        VariableRecoveryStateBase._tops[bits] = r
+        r = VariableRecoveryStateBase._tops.get(bits, None)
+        if r is None:
+            r = claripy.BVS("top", bits, explicit_name=True)
+            VariableRecoveryStateBase._tops[bits] = r
         return r
 
     @staticmethod
@@ -245,14 +250,10 @@ class VariableRecoveryStateBase:
         return None
 
     def stack_addr_from_offset(self, offset: int) -> int:
-        if self.arch.bits == 32:
-            base = 0x7fff_fe00
-            mask = 0xffff_ffff
-        elif self.arch.bits == 64:
-            base = 0x7f_ffff_fffe_0000
-            mask = 0xffff_ffff_ffff_ffff
-        else:
+        base_and_mask = self._stack_bases.get(self.arch.bits, None)
+        if base_and_mask is None:
             raise RuntimeError("Unsupported bits %d" % self.arch.bits)
+        base, mask = base_and_mask
         return (offset + base) & mask
 
     @property
@@ -236,43 +236,13 @@ class VariableManagerInternal(Serializable):
         return ident
 
     def add_variable(self, sort, start, variable):
-        if sort == 'stack':
-            region = self._stack_region
-        elif sort == 'register':
-            region = self._register_region
-        elif sort == 'global':
-            region = self._global_region
-        else:
-            raise ValueError('Unsupported sort %s in add_variable().' % sort)
-        existing = [x for x in region.get_variables_by_offset(start) if x.ident == variable.ident]
-        if len(existing) == 1:
-            var = existing[0]
-            if var.name is not None and not variable.renamed:
-                variable.name = var.name
-                variable.renamed = var.renamed
-        else:
-            # implicitly overwrite or add I guess
-            pass
+        region = self._get_region(sort, 'add_variable')
+        self._inherit_variable_name(region, start, variable)
         region.add_variable(start, variable)
 
     def set_variable(self, sort, start, variable: SimVariable):
-        if sort == 'stack':
-            region = self._stack_region
-        elif sort == 'register':
-            region = self._register_region
-        elif sort == 'global':
-            region = self._global_region
-        else:
-            raise ValueError('Unsupported sort %s in set_variable().' % sort)
-        existing = [x for x in region.get_variables_by_offset(start) if x.ident == variable.ident]
-        if len(existing) == 1:
-            var = existing[0]
-            if var.name is not None and not variable.renamed:
-                variable.name = var.name
-                variable.renamed = var.renamed
-        else:
-            # implicitly overwrite or add I guess
-            pass
+        region = self._get_region(sort, 'set_variable')
+        self._inherit_variable_name(region, start, variable)
         region.set_variable(start, variable)
 
     def write_to(self, variable, offset, location, overwrite=False, atom=None):
@@ -287,6 +257,71 @@ class VariableManagerInternal(Serializable):
         self._record_variable_access(VariableAccessSort.REFERENCE, variable, offset, location, overwrite=overwrite,
                                      atom=atom)
 
+    def add_and_write_to(self, sort, start, variable, offset, location, overwrite=False, atom=None,
+                         replace=False):
+        """
+        Add a new variable to a region and record a write access to it.
+
+        :param str sort:        Sort of the region, can be 'stack', 'register', or 'global'.
+        :param start:           Offset or address of the variable in the region.
+        :param variable:        The variable to add.
+        :param offset:          Offset into the variable that is accessed.
+        :param location:        The code location of the access.
+        :param bool overwrite:  Whether existing accesses should be overwritten.
+        :param atom:            The atom of the access.
+        :param bool replace:    Replace existing variables at `start` (like set_variable()) instead of adding to them.
+        :return:                None
+        """
+        self._add_variable_and_record_access(sort, start, variable, VariableAccessSort.WRITE, offset, location,
+                                             overwrite=overwrite, atom=atom, replace=replace)
+
+    def add_and_read_from(self, sort, start, variable, offset, location, overwrite=False, atom=None,
+                          replace=False):
+        """
+        Add a new variable to a region and record a read access to it. See add_and_write_to() for the parameters.
+        """
+        self._add_variable_and_record_access(sort, start, variable, VariableAccessSort.READ, offset, location,
+                                             overwrite=overwrite, atom=atom, replace=replace)
+
+    def add_and_reference_at(self, sort, start, variable, offset, location, overwrite=False, atom=None,
+                             replace=False):
+        """
+        Add a new variable to a region and record a reference to it. See add_and_write_to() for the parameters.
+        """
+        self._add_variable_and_record_access(sort, start, variable, VariableAccessSort.REFERENCE, offset, location,
+                                             overwrite=overwrite, atom=atom, replace=replace)
+
+    def _get_region(self, sort, caller) -> KeyedRegion:
+        if sort == 'stack':
+            return self._stack_region
+        elif sort == 'register':
+            return self._register_region
+        elif sort == 'global':
+            return self._global_region
+        raise ValueError('Unsupported sort %s in %s().' % (sort, caller))
+
+    @staticmethod
+    def _inherit_variable_name(region: KeyedRegion, start, variable: SimVariable) -> None:
+        existing = [x for x in region.get_variables_by_offset(start) if x.ident == variable.ident]
+        if len(existing) == 1:
+            var = existing[0]
+            if var.name is not None and not variable.renamed:
+                variable.name = var.name
+                variable.renamed = var.renamed
+        else:
+            # implicitly overwrite or add I guess
+            pass
+
+    def _add_variable_and_record_access(self, sort, start, variable, access_sort: int, offset, location,
+                                        overwrite=False, atom=None, replace=False):
+        region = self._get_region(sort, 'set_variable' if replace else 'add_variable')
+        self._inherit_variable_name(region, start, variable)
+        if replace:
+            region.set_variable(start, variable)
+        else:
+            region.add_variable(start, variable)
+        self._record_variable_access(access_sort, variable, offset, location, overwrite=overwrite, atom=atom)
+
     def _record_variable_access(self, sort: int, variable, offset, location, overwrite=False, atom=None):
         self._variables.add(variable)
         var_and_offset = variable, offset
@@ -376,21 +411,17 @@ class VariableManagerInternal(Serializable):
 
     def find_variables_by_stmt(self, block_addr: int, stmt_idx: int, sort: str) -> List[Tuple[SimVariable,int]]:
 
-        key = block_addr, stmt_idx
-
-        if key not in self._stmt_to_variable:
-            return [ ]
-
-        variables = self._stmt_to_variable[key]
+        # use get() so that the defaultdict does not grow on misses
+        variables = self._stmt_to_variable.get((block_addr, stmt_idx), None)
         if not variables:
             return [ ]
 
         if sort == 'memory':
-            var_and_offsets = list((var, offset) for var, offset in self._stmt_to_variable[key]
-                                   if isinstance(var, (SimStackVariable, SimMemoryVariable)))
+            var_and_offsets = [(var, offset) for var, offset in variables
+                               if isinstance(var, (SimStackVariable, SimMemoryVariable))]
         elif sort == 'register':
-            var_and_offsets = list((var, offset) for var, offset in self._stmt_to_variable[key]
-                                   if isinstance(var, SimRegisterVariable))
+            var_and_offsets = [(var, offset) for var, offset in variables
+                               if isinstance(var, SimRegisterVariable)]
         else:
             l.error('find_variables_by_stmt(): Unsupported variable sort "%s".', sort)
             return [ ]
@@ -402,16 +433,14 @@ class VariableManagerInternal(Serializable):
 
     def find_variables_by_atom(self, block_addr, stmt_idx, atom) -> Set[Tuple[SimVariable, int]]:
 
-        key = block_addr, stmt_idx
-
-        if key not in self._atom_to_variable:
+        atoms = self._atom_to_variable.get((block_addr, stmt_idx), None)
+        if atoms is None:
             return set()
 
-        atom_hash = hash(atom) & 0xffff_ffff
-        if atom_hash not in self._atom_to_variable[key]:
+        variables = atoms.get(hash(atom) & 0xffff_ffff, None)
+        if variables is None:
             return set()
-
-        return self._atom_to_variable[key][atom_hash]
+        return variables
 
     def get_variable_accesses(self, variable: SimVariable, same_name: bool=False) -> List[VariableAccess]:
 
@@ -4,7 +4,7 @@ from typing import Iterable, Tuple, Any, Optional
 import claripy
 
 from ...state_plugins.plugin import SimStatePlugin
-from ...errors import SimMemoryError
+from ...errors import SimMemoryError, SimMemoryMissingError
 
 
 class MemoryMixin(SimStatePlugin):
@@ -331,6 +331,29 @@ class MultiValuedMemory(
         kwargs['fill_missing'] = False
         return super()._default_value(addr, size, **kwargs)
 
+    def load_optional(self, addr, size=None, endness=None, **kwargs):
+        """
+        Load data from memory, but return None instead of raising SimMemoryMissingError when the requested bytes do not
+        exist.
+
+        :param addr:    The address to load from.
+        :param size:    The number of bytes to load.
+        :param endness: Endianness of the load.
+        :return:        A MultiValues object, or None if the data does not exist.
+        """
+
+        if type(addr) is int and type(size) is int:
+            # fast path: the load is contained in a single page that has never been created, so there is nothing to
+            # load and no need to go through an exception
+            pageno, pageoff = divmod(addr, self.page_size)
+            if pageoff + size <= self.page_size and self._pages.get(pageno, None) is None:
+                return None
+
+        try:
+            return self.load(addr, size=size, endness=endness, **kwargs)
+        except SimMemoryMissingError:
+            return None
+
 
 class KeyValueMemory(
     KeyValueMemoryMixin,
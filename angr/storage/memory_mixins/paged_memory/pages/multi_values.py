@@ -15,6 +15,18 @@ class MultiValues:
             if not isinstance(vs, set):
                 raise TypeError("Each value in offset_to_values must be a set!")
 
+    @classmethod
+    def from_single(cls, value: claripy.ast.Base) -> 'MultiValues':
+        """
+        Create a MultiValues object that holds exactly one value at offset 0. The sanity check in __init__() is skipped.
+
+        :param value:   The value.
+        :return:        A new MultiValues object.
+        """
+        mv = cls.__new__(cls)
+        mv.values = {0: {value}}
+        return mv
+
     def add_value(self, offset, value) -> None:
         if offset not in self.values:
             self.values[offset] = set()
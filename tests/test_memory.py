@@ -812,8 +812,24 @@ def test_multivalued_list_page():
     assert len(a.values[1]) == 2
 
 
+def test_multivalued_load_optional():
+    state = SimState(arch='AMD64', mode='symbolic', plugins={'memory': MultiValuedMemory()})
+
+    # the page does not exist
+    assert state.memory.load_optional(0x100, size=8) is None
+
+    state.memory.store(0x100, claripy.BVV(0x40, 64))
+    a = state.memory.load_optional(0x100, size=8)
+    assert a is not None
+    assert a.one_value() is claripy.BVV(0x40, 64)
+
+    # the page exists, but the bytes do not
+    assert state.memory.load_optional(0x200, size=8) is None
+
+
 if __name__ == '__main__':
     test_multivalued_list_page()
+    test_multivalued_load_optional()
     test_address_wrap()
     test_concrete_load()
     test_crosspage_store()